@@ -2,15 +2,16 @@ import sqlite3
 import os
 from datetime import datetime
 
-def init_database():
-    """Initialize the online judge database with required tables"""
-    
-    # Create database directory if it doesn't exist
-    os.makedirs("data", exist_ok=True)
-    
-    # Connect to SQLite database
-    conn = sqlite3.connect("data/online_judge.db")
-    cursor = conn.cursor()
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; fall back to SQLite's own locking
+    fcntl = None
+
+DB_PATH = "data/online_judge.db"
+SCHEMA_LOCK_PATH = "data/.schema.lock"
+
+def _create_tables(cursor):
+    """Migration 1: create all tables (idempotent for pre-versioned databases)"""
     
     # Create problems table
     cursor.execute("""
@@ -57,15 +58,57 @@ def init_database():
             FOREIGN KEY (problem_id) REFERENCES problems (id)
         )
     """)
+
+# Ordered schema migrations; MIGRATIONS[i] upgrades user_version i to i + 1.
+# Never edit an existing step: append a new one (e.g. ALTER TABLE ... ADD
+# COLUMN) so databases already stamped at an older version pick it up.
+MIGRATIONS = [
+    _create_tables,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def ensure_schema() -> bool:
+    """Bring the database schema up to date, safe to call from every worker.
     
-    conn.commit()
-    conn.close()
+    Holds an exclusive file lock so concurrent workers don't race each other,
+    and applies only the migrations after the version stored in
+    PRAGMA user_version. Returns True if a migration was applied.
+    """
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    
+    with open(SCHEMA_LOCK_PATH, "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            conn = sqlite3.connect(DB_PATH)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA user_version")
+                current_version = cursor.fetchone()[0]
+                if current_version >= SCHEMA_VERSION:
+                    return False
+                
+                for version in range(current_version, SCHEMA_VERSION):
+                    MIGRATIONS[version](cursor)
+                    cursor.execute(f"PRAGMA user_version = {version + 1}")
+                    conn.commit()
+                return True
+            finally:
+                conn.close()
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def init_database():
+    """Initialize the online judge database with required tables"""
+    ensure_schema()
     print("Database initialized successfully!")
 
 def add_sample_problem():
     """Add a sample problem for testing"""
     
-    conn = sqlite3.connect("data/online_judge.db")
+    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     # Check if sample problem already exists
@@ -1,9 +1,11 @@
 import sqlite3
 from typing import List, Dict, Optional
 
+from database import DB_PATH
+
 def get_db_connection():
     """Get database connection"""
-    conn = sqlite3.connect("data/online_judge.db")
+    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # Enable column access by name
     return conn
 
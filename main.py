@@ -1,32 +1,109 @@
 # main.py - Enhanced FastAPI Online Judge
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
+from contextlib import asynccontextmanager, closing
 from pydantic import BaseModel
 import subprocess
 import os
+import shutil
 import uuid
 import tempfile
-import psutil
 import threading
 import time
 import sqlite3
 from typing import List, Optional
 import json
 
+from database import DB_PATH, ensure_schema
+
+# Readiness state, filled in by the startup lifecycle
+startup_state = {
+    "schema_ready": False,
+    "warm": False,
+    "interpreters": {},
+    "error": None,
+}
+
+# Languages whose interpreter must be on PATH before /api/health reports
+# ready, e.g. JUDGE_REQUIRED_LANGUAGES="python,javascript". Empty by default.
+REQUIRED_LANGUAGES = [
+    lang.strip()
+    for lang in os.environ.get("JUDGE_REQUIRED_LANGUAGES", "").split(",")
+    if lang.strip()
+]
+
+# Warm-up retry backoff, in seconds
+WARM_UP_INITIAL_DELAY = 0.5
+WARM_UP_MAX_DELAY = 30
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Migrate the schema and warm caches in the background"""
+    ensure_schema()
+    startup_state["schema_ready"] = True
+    
+    warm_thread = threading.Thread(target=warm_up, daemon=True)
+    warm_thread.start()
+    yield
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Online Judge Platform",
     description="Competitive Programming Platform with Problems and Submissions",
+    lifespan=lifespan,
 )
 
-# Templates for HTML pages
-templates = Jinja2Templates(directory="templates")
+# Templates for HTML pages, built on first use
+_templates = None
+_templates_lock = threading.Lock()
+
+def get_templates():
+    global _templates
+    if _templates is None:
+        with _templates_lock:
+            if _templates is None:
+                from fastapi.templating import Jinja2Templates
+                _templates = Jinja2Templates(directory="templates")
+    return _templates
+
+def warm_up_once():
+    """Pre-load heavy modules, compile templates and check judge interpreters"""
+    import psutil  # noqa: F401
+    
+    templates = get_templates()
+    for name in ("home.html", "problem.html", "submissions.html"):
+        templates.get_template(name)
+    
+    with closing(get_db_connection()) as conn:
+        conn.execute("SELECT 1 FROM problems LIMIT 1").fetchall()
+    
+    startup_state["interpreters"] = {
+        "python": shutil.which("python") is not None,
+        "javascript": shutil.which("node") is not None,
+    }
+
+def warm_up():
+    """Run warm-up until it succeeds, backing off between failed attempts
+    (e.g. "database is locked" while another worker is writing)"""
+    delay = WARM_UP_INITIAL_DELAY
+    while True:
+        try:
+            warm_up_once()
+        except Exception as e:
+            print(f"Warm-up error, retrying in {delay}s: {e}")
+            startup_state["error"] = str(e)
+            time.sleep(delay)
+            delay = min(delay * 2, WARM_UP_MAX_DELAY)
+            continue
+        
+        startup_state["error"] = None
+        startup_state["warm"] = True
+        return
 
 # Database helper functions
 def get_db_connection():
-    conn = sqlite3.connect("data/online_judge.db")
+    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -59,6 +136,7 @@ class ResourceMonitor:
         self.monitoring = True
         
         def monitor():
+            import psutil
             try:
                 proc = psutil.Process(process.pid)
                 while self.monitoring and proc.is_running():
@@ -284,7 +362,7 @@ async def home(request: Request):
     problems = [dict(row) for row in cursor.fetchall()]
     conn.close()
     
-    return templates.TemplateResponse("home.html", {
+    return get_templates().TemplateResponse("home.html", {
         "request": request,
         "problems": problems
     })
@@ -317,7 +395,7 @@ async def problem_page(request: Request, problem_id: int):
     
     conn.close()
     
-    return templates.TemplateResponse("problem.html", {
+    return get_templates().TemplateResponse("problem.html", {
         "request": request,
         "problem": dict(problem),
         "sample_cases": sample_cases,
@@ -428,11 +506,43 @@ async def submissions_page(request: Request):
     submissions = [dict(row) for row in cursor.fetchall()]
     conn.close()
     
-    return templates.TemplateResponse("submissions.html", {
+    return get_templates().TemplateResponse("submissions.html", {
         "request": request,
         "submissions": submissions
     })
 
+@app.get("/api/health")
+async def health():
+    """Readiness probe: 503 until schema migration and warm-up have finished
+    and every interpreter in JUDGE_REQUIRED_LANGUAGES is available"""
+    interpreters = startup_state["interpreters"]
+    missing = [lang for lang, found in interpreters.items() if not found]
+    missing_required = [
+        lang for lang in REQUIRED_LANGUAGES if not interpreters.get(lang)
+    ]
+    warm = startup_state["schema_ready"] and startup_state["warm"]
+    ready = warm and not missing_required
+    
+    if ready:
+        status = "ready"
+    elif warm:
+        status = "unavailable"
+    else:
+        status = "starting"
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": status,
+            "schema_ready": startup_state["schema_ready"],
+            "warm": startup_state["warm"],
+            "interpreters": interpreters,
+            "missing_interpreters": missing,
+            "required_languages": REQUIRED_LANGUAGES,
+            "error": startup_state["error"],
+        },
+    )
+
 # Mount static files (must be last)
 app.mount("/static", StaticFiles(directory="templates"), name="static")
 app.mount("/public", StaticFiles(directory="public", html=True), name="static")